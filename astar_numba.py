@@ -0,0 +1,163 @@
+"""
+A* 경로 탐색 커널.
+
+numba가 설치되어 있으면 네이티브 코드로 컴파일해서 사용하고,
+numba를 쓸 수 없는 환경(pygbag 웹 배포 등)에서는 NUMBA_AVAILABLE이 False가 되어
+main.py의 파이썬 A* 구현이 대신 사용됩니다.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # numba가 없으면 데코레이터가 함수를 그대로 돌려주도록 대체
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, boundscheck=False)
+def astar_core(walk, W, H, sx, sy, ex, ey):
+    """
+    통과 가능 비트맵 위에서 A* 탐색을 수행합니다.
+    :param walk: (H, W) uint8 배열 (1이면 통로)
+    :param W: 미로 가로 타일 수
+    :param H: 미로 세로 타일 수
+    :return: y*W+x 인덱스별 부모 인덱스 배열 (int32, 도달하지 못한 칸은 -1)
+    """
+    n = W * H
+    start = sy * W + sx
+    end = ey * W + ex
+
+    parent = np.full(n, -1, dtype=np.int32)
+    g_score = np.full(n, n + 1, dtype=np.int32) # 경로 길이는 n을 넘을 수 없으므로 n+1을 무한대로 사용
+    visited = np.zeros(n, dtype=np.bool_)
+
+    # 이진 힙 (f_score, 인덱스)을 두 배열로 관리. 칸마다 최대 4번 push되므로 4n+1이면 충분
+    heap_f = np.empty(4 * n + 1, dtype=np.int32)
+    heap_idx = np.empty(4 * n + 1, dtype=np.int32)
+    size = 1
+    heap_f[0] = abs(sx - ex) + abs(sy - ey)
+    heap_idx[0] = start
+    g_score[start] = 0
+
+    while size > 0:
+        # 힙에서 최솟값 꺼내기
+        current = heap_idx[0]
+        size -= 1
+        last_f = heap_f[size]
+        last_idx = heap_idx[size]
+        i = 0
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and (heap_f[child + 1] < heap_f[child] or
+                                     (heap_f[child + 1] == heap_f[child] and heap_idx[child + 1] < heap_idx[child])):
+                child += 1
+            if heap_f[child] < last_f or (heap_f[child] == last_f and heap_idx[child] < last_idx):
+                heap_f[i] = heap_f[child]
+                heap_idx[i] = heap_idx[child]
+                i = child
+            else:
+                break
+        heap_f[i] = last_f
+        heap_idx[i] = last_idx
+
+        # 이미 확정된 칸의 오래된 항목은 건너뜀 (지연 삭제)
+        if visited[current]:
+            continue
+        visited[current] = True
+
+        if current == end:
+            break
+
+        cy = current // W
+        cx = current - cy * W
+        tentative = g_score[current] + 1
+
+        for d in range(4):
+            if d == 0:
+                nx, ny = cx, cy + 1
+            elif d == 1:
+                nx, ny = cx + 1, cy
+            elif d == 2:
+                nx, ny = cx, cy - 1
+            else:
+                nx, ny = cx - 1, cy
+
+            if nx < 0 or nx >= W or ny < 0 or ny >= H:
+                continue
+            if walk[ny, nx] == 0:
+                continue
+
+            neighbor = ny * W + nx
+            if visited[neighbor] or tentative >= g_score[neighbor]:
+                continue
+
+            g_score[neighbor] = tentative
+            parent[neighbor] = current
+
+            # 힙에 넣고 위로 올리기
+            f = tentative + abs(nx - ex) + abs(ny - ey)
+            i = size
+            size += 1
+            while i > 0:
+                up = (i - 1) // 2
+                if f < heap_f[up] or (f == heap_f[up] and neighbor < heap_idx[up]):
+                    heap_f[i] = heap_f[up]
+                    heap_idx[i] = heap_idx[up]
+                    i = up
+                else:
+                    break
+            heap_f[i] = f
+            heap_idx[i] = neighbor
+
+    return parent
+
+
+@njit(cache=True, boundscheck=False)
+def bfs_core(walk, W, H, ox, oy, dist, step):
+    """
+    기준점 (ox, oy)에서 BFS 파면을 퍼뜨려 거리 필드와 방향 필드를 채웁니다.
+    :param walk: (H, W) uint8 배열 (1이면 통로)
+    :param dist: (H, W) int32 출력 배열, 기준점까지의 칸 수 (도달 불가 -1)
+    :param step: (H, W) int8 출력 배열, 기준점 쪽으로 한 칸 다가가는 방향 (NEIGHBORS4 인덱스, 없으면 -1)
+    """
+    dist[:, :] = -1
+    step[:, :] = -1
+    if walk[oy, ox] == 0:
+        return # 기준점이 벽 안이면 (벽 통과 중) 아무 곳에서도 도달 불가
+
+    # main.NEIGHBORS4와 같은 순서: (0, 1), (1, 0), (0, -1), (-1, 0)
+    dxs = (0, 1, 0, -1)
+    dys = (1, 0, -1, 0)
+
+    queue = np.empty(W * H, dtype=np.int32)
+    head = 0
+    tail = 1
+    queue[0] = oy * W + ox
+    dist[oy, ox] = 0
+
+    while head < tail:
+        current = queue[head]
+        head += 1
+        cy = current // W
+        cx = current - cy * W
+        next_dist = dist[cy, cx] + 1
+
+        for d in range(4):
+            nx = cx + dxs[d]
+            ny = cy + dys[d]
+            if nx < 0 or nx >= W or ny < 0 or ny >= H:
+                continue
+            if walk[ny, nx] == 0 or dist[ny, nx] >= 0:
+                continue
+            dist[ny, nx] = next_dist
+            step[ny, nx] = (d + 2) & 3 # 들어온 방향의 반대쪽이 기준점으로 돌아가는 방향
+            queue[tail] = ny * W + nx
+            tail += 1
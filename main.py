@@ -4,9 +4,11 @@ import time
 import math
 from enum import Enum
 import heapq
-from dataclasses import dataclass, field
-from typing import List, Tuple, Dict
+from collections import deque
+import numpy as np
+from typing import List, Tuple, Dict, NamedTuple
 import asyncio
+from astar_numba import NUMBA_AVAILABLE, astar_core, bfs_core
 
 # 게임 설정
 SCREEN_WIDTH = 800
@@ -26,6 +28,7 @@ PLAYER_COLOR = (0, 128, 255)
 STAR_COLOR = (255, 255, 0)
 EXIT_COLOR = (0, 200, 0)
 FOG_COLOR = (30, 30, 30) # 시야 밖 영역 색상
+FOG_HOLE_KEY = (255, 0, 255) # 안개 표면에서 투명하게 처리할 컬러키 (시야 안 영역)
 MINIMAP_ITEM_COLOR = (100, 200, 255) # 미니맵 아이템 색상 (하늘색)
 EVENT_BOX_COLOR = (150, 0, 150) # 이벤트 상자 색상 (보라색)
 
@@ -61,11 +64,29 @@ class EventType(Enum):
 
 # 시야 및 게임 시간
 VISION_RADIUS = 5 # 플레이어 시야 반경 (타일 단위)
+VISION_RADIUS_SQ = VISION_RADIUS * VISION_RADIUS # 거리 제곱 비교용 (매 프레임 제곱 계산을 피함)
 GAME_TIME_LIMIT = 300 # 게임 시간 제한 (초)
+FLOOR_BUCKET_SHIFT = 3 # 통로 칸 공간 색인의 버킷 크기 (2**3 = 8x8 타일)
+FPS = 60 # 초당 최대 프레임 수 (이보다 빨리 그리지 않도록 제한)
+MAX_GAME_MESSAGES = 6 # 동시에 표시하는 게임 메시지 최대 개수
+TEXT_CACHE_SIZE = 512 # 렌더링해 둔 글자 표면 캐시의 최대 항목 수
+
+# 상하좌우 이웃 방향 (미로 생성, A*, BFS 방향 필드의 0~3 인덱스에서 공통 사용)
+NEIGHBORS4 = ((0, 1), (1, 0), (0, -1), (-1, 0))
+
+# 별 방향 표시용 8방위 (서쪽에서 시작해 반시계 방향, 45도 간격)
+STAR_DIRECTIONS = ("서쪽", "남서쪽", "남쪽", "남동쪽", "동쪽", "북동쪽", "북쪽", "북서쪽")
+
+# 입력 처리에서 매 프레임 pygame 모듈 속성을 찾지 않도록 키/이벤트 상수를 미리 꺼내 둠
+_K_W, _K_A, _K_S, _K_D = pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d
+_K_UP, _K_DOWN, _K_LEFT, _K_RIGHT = pygame.K_UP, pygame.K_DOWN, pygame.K_LEFT, pygame.K_RIGHT
+_K_LSHIFT, _K_SPACE, _K_R, _K_RETURN = pygame.K_LSHIFT, pygame.K_SPACE, pygame.K_r, pygame.K_RETURN
+_QUIT, _KEYDOWN = pygame.QUIT, pygame.KEYDOWN
 
 ### **Position 클래스**
-@dataclass
-class Position:
+class Position(NamedTuple):
+    # 튜플 기반이라 생성/속성 접근/비교/해시가 C 수준에서 처리됨 (A*/AI 이동에서 대량 생성)
+    # 비교(heapq 정렬)와 해시, 동등 비교는 (x, y) 튜플 규칙을 그대로 따름
     x: int
     y: int
 
@@ -74,23 +95,13 @@ class Position:
 
     def distance_to(self, other):
         """두 위치 간의 유클리드 거리 반환"""
-        return math.sqrt((self.x - other.x)**2 + (self.y - other.y)**2)
+        return math.hypot(self.x - other.x, self.y - other.y)
 
-    def __lt__(self, other):
-        # heapq에서 사용하기 위한 비교 연산자 정의
-        if self.x == other.x:
-            return self.y < other.y
-        return self.x < other.x
-    
-    def __hash__(self):
-        # 딕셔너리 키로 사용하기 위한 해시 함수 정의
-        return hash((self.x, self.y))
-
-    def __eq__(self, other):
-        # 동일성 비교를 위한 동등 연산자 정의
-        if not isinstance(other, Position):
-            return NotImplemented
-        return self.x == other.x and self.y == other.y
+    def distance_sq(self, other):
+        """두 위치 간의 유클리드 거리 제곱 반환 (거리 비교만 할 때 sqrt 없이 사용)"""
+        dx = self.x - other.x
+        dy = self.y - other.y
+        return dx * dx + dy * dy
 
 
 class MazeGenerator:
@@ -129,7 +140,7 @@ class MazeGenerator:
             x = random.randint(1, self.width-2)
             y = random.randint(1, self.height-2)
             if self.maze[y][x] == 1:
-                neighbors_count = sum(1 for dx, dy in [(0,1),(1,0),(0,-1),(-1,0)] 
+                neighbors_count = sum(1 for dx, dy in NEIGHBORS4
                                     if self.maze[y+dy][x+dx] == 0)
                 if neighbors_count >= 2:
                     self.maze[y][x] = 0
@@ -154,11 +165,13 @@ class Player:
         self.invincible_until = 0 # 무적 시간 종료
         self.wall_pass_until = 0  # 벽 통과 시간 종료
 
-    def move(self, dx, dy, maze):
+    def move(self, dx, dy, walkable):
         """플레이어 이동 처리"""
-        current_time = time.time()
+        current_time = self._now()
         
-        is_sprinting = pygame.key.get_pressed()[pygame.K_LSHIFT] and self.sprint_cooldown <= 0
+        # 이번 프레임에 handle_input에서 읽어 둔 키 상태 재사용
+        keys = self.game_instance.keys if self.game_instance and self.game_instance.keys else pygame.key.get_pressed()
+        is_sprinting = keys[_K_LSHIFT] and self.sprint_cooldown <= 0
         
         move_delay_factor = 0.5 if is_sprinting else 1.0 # 스프린트 시 이동 딜레이 절반
 
@@ -171,7 +184,7 @@ class Player:
             return False # 미로 밖으로는 이동 불가
 
         # 벽 통과 상태 확인
-        if self.is_wall_passing() or maze[new_y][new_x] == 0:
+        if self.is_wall_passing() or walkable[new_y, new_x]:
             self.pos = Position(new_x, new_y)
             self.last_move_time = current_time
             self.last_move_direction = (dx, dy) # 마지막 이동 방향 업데이트
@@ -182,10 +195,16 @@ class Player:
         """게임 인스턴스를 설정하는 메서드 (AI와 유사)"""
         self.game_instance = game_instance
 
+    def _now(self):
+        """현재 틱 시각 반환 (게임 인스턴스가 없으면 실제 시각)"""
+        if self.game_instance:
+            return self.game_instance.now
+        return time.time()
+
     def activate_stealth(self):
         """은신 활성화"""
         if self.stealth_charges > 0 and self.stealth_active == 0:
-            self.stealth_active = time.time() + 5.0 # 5초간 은신 활성화
+            self.stealth_active = self._now() + 5.0 # 5초간 은신 활성화
             self.stealth_charges -= 1
             if self.game_instance: # 메시지 시스템 활용
                 self.game_instance.add_game_message("은신 활성화!")
@@ -193,7 +212,7 @@ class Player:
     def is_stealthed(self):
         """은신 활성화 여부 반환"""
         if self.stealth_active > 0:
-            if time.time() < self.stealth_active:
+            if self._now() < self.stealth_active:
                 return True
             else:
                 self.stealth_active = 0 # 은신 시간 만료
@@ -204,27 +223,27 @@ class Player:
     def get_stealth_remaining_time(self):
         """은신 남은 시간 반환 (초)"""
         if self.stealth_active > 0:
-            return max(0, self.stealth_active - time.time())
+            return max(0, self.stealth_active - self._now())
         return 0
 
     def is_invincible(self):
         """무적 상태 여부 반환"""
-        return time.time() < self.invincible_until
+        return self._now() < self.invincible_until
     
     def get_invincible_remaining_time(self):
         """무적 남은 시간 반환 (초)"""
         if self.is_invincible():
-            return max(0, self.invincible_until - time.time())
+            return max(0, self.invincible_until - self._now())
         return 0
 
     def is_wall_passing(self):
         """벽 통과 상태 여부 반환"""
-        return time.time() < self.wall_pass_until
+        return self._now() < self.wall_pass_until
 
     def get_wall_pass_remaining_time(self):
         """벽 통과 남은 시간 반환 (초)"""
         if self.is_wall_passing():
-            return max(0, self.wall_pass_until - time.time())
+            return max(0, self.wall_pass_until - self._now())
         return 0
 
 
@@ -235,8 +254,12 @@ class AI:
         self.game_instance = game_instance # StarMazeGame 인스턴스 참조
         self.last_move_time = 0
         self.patrol_path = []
-        self.path_index = 0
-        self.chase_path = [] # 추적 경로
+        self.patrol_steps = [] # 순찰 지점들을 잇는 전체 경로 (칸 단위, 순환)
+        self.patrol_step_idx = 0
+        self.chase_path = [] # 추적 경로 (읽기 전용, chase_idx로 진행 위치 관리)
+        self.chase_idx = 0 # chase_path에서 다음에 이동할 칸의 인덱스
+        self.follow_field = False # True면 chase_path 대신 플레이어 BFS 필드를 따라 이동
+        self.last_chase_target = None # 마지막으로 경로를 계산한 목표 (재계산 생략 판단용)
 
         self.base_move_delay = 0 # 기본 이동 딜레이 (초기화 시 설정)
         self.vision_radius = 0 # 시야 반경 (초기화 시 설정)
@@ -256,47 +279,98 @@ class AI:
         
         self.current_move_delay = self.base_move_delay # 현재 적용되는 이동 딜레이
 
+        # 타입별 행동 메서드와 색상을 생성 시 한 번만 정해 둠 (매 틱 타입 분기 없음)
+        self._behave = {
+            AIType.PATROL: self._patrol_behavior,
+            AIType.DETECTOR: self._detector_behavior,
+            AIType.ENHANCED: self._enhanced_behavior,
+        }[self.type]
+        self._color = {
+            AIType.PATROL: PATROL_AI_COLOR,
+            AIType.DETECTOR: DETECTOR_AI_COLOR,
+            AIType.ENHANCED: ENHANCED_AI_COLOR,
+        }.get(self.type, WHITE)
+
     def get_color(self):
         """AI 타입에 따른 색상 반환"""
-        if self.type == AIType.PATROL:
-            return PATROL_AI_COLOR
-        elif self.type == AIType.DETECTOR:
-            return DETECTOR_AI_COLOR
-        elif self.type == AIType.ENHANCED:
-            return ENHANCED_AI_COLOR
-        return WHITE
+        return self._color
 
-    def can_move(self, maze):
+    def can_move(self, walkable):
         """AI가 이동할 수 있는지 확인 (딜레이 기반)"""
-        current_time = time.time()
+        current_time = self.game_instance.now
         if current_time - self.last_move_time < self.current_move_delay: # current_move_delay 사용
             return False
         self.last_move_time = current_time
         return True
 
-    def move_to(self, target_pos: Position, maze):
+    def move_to(self, target_pos: Position, walkable):
         """AI를 목표 위치로 이동"""
-        if self.chase_path:
-            next_step = self.chase_path[0]
-            if 0 <= next_step.x < MAZE_WIDTH and 0 <= next_step.y < MAZE_HEIGHT and maze[next_step.y][next_step.x] == 0:
+        if self.follow_field:
+            target = self.chase_path[-1]
+            if target == self.game_instance.field_origin:
+                # 플레이어를 추적 중이면 공유 BFS 필드에서 다음 칸을 바로 읽음
+                next_step = self.game_instance.next_step_to_player(self.pos)
+                if next_step is None:
+                    self.clear_chase()
+                    return False
                 self.pos = next_step
-                self.chase_path.pop(0) # 다음 스텝으로 이동했으니 경로에서 제거
+                if next_step == target:
+                    self.clear_chase()
+                return True
+            # 플레이어가 움직여 필드 기준점이 바뀌었으면 원래 목표까지 A*로 경로 계산
+            self.follow_field = False
+            self.chase_path = self.game_instance.find_path_astar(self.pos, target)
+            self.chase_idx = 0
+
+        if self.chase_idx < len(self.chase_path):
+            next_step = self.chase_path[self.chase_idx]
+            if 0 <= next_step.x < MAZE_WIDTH and 0 <= next_step.y < MAZE_HEIGHT and walkable[next_step.y, next_step.x]:
+                self.pos = next_step
+                self.chase_idx += 1 # 리스트를 당기지 않고 커서만 다음 스텝으로 이동
                 return True
         return False
 
+    def clear_chase(self):
+        """추적 경로 초기화"""
+        self.follow_field = False
+        self.chase_path = []
+        self.chase_idx = 0
+
+    def chase_steps_left(self):
+        """추적 경로에 남은 칸 수 반환"""
+        return len(self.chase_path) - self.chase_idx
+
     def set_patrol_path(self, path: List[Position]):
-        """순찰 경로 설정"""
+        """순찰 경로 설정 (미로가 고정이므로 지점 사이 A* 경로를 미리 이어 붙여 둠)"""
         self.patrol_path = path
-        self.path_index = 0
+        self.patrol_steps = []
+        for i in range(len(path)):
+            self.patrol_steps.extend(self.game_instance.find_path_astar(path[i], path[(i + 1) % len(path)]))
+        self.patrol_step_idx = 0
 
     def set_chase_target(self, target_pos: Position):
         """추적 목표 설정 및 A* 경로 계산"""
+        # 목표가 그대로이고 기존 경로가 아직 남아 있으면 다시 계산하지 않음
+        if target_pos == self.last_chase_target and self.chase_steps_left() > 1:
+            return
+        self.last_chase_target = target_pos
+
+        if target_pos == self.game_instance.field_origin:
+            # 플레이어 위치는 틱마다 계산되는 BFS 필드로 추적하므로 A*가 필요 없음
+            self.follow_field = True
+            self.chase_path = [target_pos]
+            self.chase_idx = 0
+            return
+        self.follow_field = False
         path = self.game_instance.find_path_astar(self.pos, target_pos) 
         self.chase_path = path
+        self.chase_idx = 0
 
-    def _patrol_behavior(self, player_pos, player_stealthed, maze):
+    def _patrol_behavior(self, player, walkable):
         """순찰 AI 행동 로직: 평소 순찰, 플레이어 시야 내 추적"""
-        player_in_sight = not player_stealthed and self.pos.distance_to(player_pos) < self.vision_radius
+        player_pos = player.pos
+        player_stealthed = player.is_stealthed()
+        player_in_sight = not player_stealthed and self.pos.distance_sq(player_pos) < self.vision_radius * self.vision_radius
 
         if player_in_sight:
             # 플레이어 발견 시 추적
@@ -306,93 +380,92 @@ class AI:
                 self.last_known_player_pos = player_pos
         elif self.is_chasing:
             # 추적 중 플레이어를 놓쳤고, 마지막으로 본 위치에 도달했다면 순찰로 복귀
-            if self.pos == self.last_known_player_pos or not self.chase_path:
+            if self.pos == self.last_known_player_pos or not self.chase_steps_left():
                 self.is_chasing = False
-                self.chase_path = [] # 추적 경로 초기화
+                self.clear_chase() # 추적 경로 초기화
                 self.last_known_player_pos = None
             else: # 마지막으로 본 위치로 계속 이동
-                self.move_to(self.chase_path[0], maze)
+                self.move_to(self.chase_path[self.chase_idx], walkable)
                 return # 추적 행동 계속
 
         # 순찰 또는 추적 중인 상태가 아니면 순찰 경로를 따름
         if not self.is_chasing:
-            if self.patrol_path:
-                # 다음 순찰 지점에 도달했으면 인덱스 업데이트
-                if self.pos == self.patrol_path[self.path_index]:
-                    self.path_index = (self.path_index + 1) % len(self.patrol_path)
-                
-                # 다음 순찰 지점으로 A* 경로 계산 및 이동
-                self.set_chase_target(self.patrol_path[self.path_index])
-                if self.chase_path:
-                    self.move_to(self.chase_path[0], maze)
-        elif self.chase_path: # 플레이어를 추적 중이고 경로가 있으면 이동
-            self.move_to(self.chase_path[0], maze)
-
-
-    def _detector_behavior(self, player_pos, player_stealthed, maze):
+            if self.patrol_steps:
+                next_step = self.patrol_steps[self.patrol_step_idx]
+                if self.pos == next_step: # 순찰 경로로 막 복귀했으면 다음 칸으로
+                    self.patrol_step_idx = (self.patrol_step_idx + 1) % len(self.patrol_steps)
+                    next_step = self.patrol_steps[self.patrol_step_idx]
+
+                if abs(next_step.x - self.pos.x) + abs(next_step.y - self.pos.y) == 1:
+                    # 순찰 경로 위에 있으면 미리 계산한 다음 칸으로 이동 (A* 없음)
+                    self.pos = next_step
+                    self.patrol_step_idx = (self.patrol_step_idx + 1) % len(self.patrol_steps)
+                else:
+                    # 추적하느라 순찰 경로를 벗어났으면 A*로 경로에 복귀
+                    if not self.chase_steps_left() or self.chase_path[-1] != next_step:
+                        self.set_chase_target(next_step)
+                    if self.chase_steps_left():
+                        self.move_to(self.chase_path[self.chase_idx], walkable)
+        elif self.chase_steps_left(): # 플레이어를 추적 중이고 경로가 있으면 이동
+            self.move_to(self.chase_path[self.chase_idx], walkable)
+
+
+    def _detector_behavior(self, player, walkable):
         """탐지 AI 행동 로직: 항상 플레이어 위치를 알고 추격"""
+        player_pos = player.pos
+        player_stealthed = player.is_stealthed()
         # 은신 중이 아니면 플레이어의 위치를 항상 알고 추격
         if not player_stealthed:
             self.set_chase_target(player_pos)
         else: # 은신 중이면, 마지막으로 본 위치 (현재 위치)에 머무름
             # 또는 마지막으로 본 위치가 없다면 (즉 처음부터 은신 중이었다면) 제자리에 머무름
-            if not self.chase_path: # 추적 경로가 없다면 (처음이거나 놓쳤을 때)
+            if not self.chase_steps_left(): # 추적 경로가 없다면 (처음이거나 놓쳤을 때)
                 self.set_chase_target(self.pos) # 현재 위치를 목표로 설정하여 움직이지 않음
         
-        if self.chase_path:
-            self.move_to(self.chase_path[0], maze)
+        if self.chase_steps_left():
+            self.move_to(self.chase_path[self.chase_idx], walkable)
 
-    def _enhanced_behavior(self, player, maze_data): # player 객체와 maze_data (미로 리스트)를 받도록 수정
+    def _enhanced_behavior(self, player, walkable): # player 객체와 walkable (통과 가능 비트맵)을 받도록 수정
         """강화 AI 행동 로직 (플레이어의 움직임 예측)"""
+        player_pos = player.pos
         # 더 빠르고 지능적인 추적
         if not player.is_stealthed(): # player 객체를 통해 is_stealthed() 호출
             prediction_steps = 3 # 3칸 앞을 예측
 
-            # 플레이어의 마지막 이동 방향을 기반으로 예측 위치 계산
-            predicted_pos = Position(
-                player.pos.x + player.last_move_direction[0] * prediction_steps,
-                player.pos.y + player.last_move_direction[1] * prediction_steps
-            )
+            # 플레이어의 마지막 이동 방향을 기반으로 예측 위치 계산 (검사는 정수로만 수행)
+            move_dx, move_dy = player.last_move_direction
+            predicted_x = player_pos.x + move_dx * prediction_steps
+            predicted_y = player_pos.y + move_dy * prediction_steps
 
             # 예측 위치가 미로 밖이거나 벽이면 그냥 현재 위치 추적
-            if not (0 <= predicted_pos.x < MAZE_WIDTH and 0 <= predicted_pos.y < MAZE_HEIGHT and
-                    maze_data[predicted_pos.y][predicted_pos.x] == 0): # 전달받은 maze_data 사용
-                self.set_chase_target(player.pos)
+            if not (0 <= predicted_x < MAZE_WIDTH and 0 <= predicted_y < MAZE_HEIGHT and
+                    walkable[predicted_y, predicted_x]): # 전달받은 walkable 사용
+                self.set_chase_target(player_pos)
             else:
-                self.set_chase_target(predicted_pos)
-            self.last_known_pos = player.pos # 플레이어가 은신하지 않을 때 마지막 위치 업데이트
+                self.set_chase_target(Position(predicted_x, predicted_y))
+            self.last_known_pos = player_pos # 플레이어가 은신하지 않을 때 마지막 위치 업데이트
         else: # 플레이어가 은신 중일 때
             # 마지막으로 본 위치로 이동하거나 무작위 순찰
             if self.last_known_pos:
                 if self.pos == self.last_known_pos: # 마지막 위치에 도달하면 놓침으로 간주
                     self.last_known_pos = None
-                    self.chase_path = [] # 경로 초기화
+                    self.clear_chase() # 경로 초기화
                 else:
                     self.set_chase_target(self.last_known_pos)
             else: # 마지막 본 위치가 없으면 순찰 AI처럼 행동
-                if not self.chase_path: 
-                    target_x, target_y = random.randint(0, MAZE_WIDTH - 1), random.randint(0, MAZE_HEIGHT - 1)
-                    while self.game_instance.maze[target_y][target_x] == 1: 
-                        target_x, target_y = random.randint(0, MAZE_WIDTH - 1), random.randint(0, MAZE_HEIGHT - 1)
-                    self.set_chase_target(Position(target_x, target_y))
+                if not self.chase_steps_left(): 
+                    self.set_chase_target(self.game_instance.random_passable_cell())
         
-        if self.chase_path:
-            self.move_to(self.chase_path[0], maze_data)
+        if self.chase_steps_left():
+            self.move_to(self.chase_path[self.chase_idx], walkable)
 
     # AI의 update 메서드 (StarMazeGame.update에서 호출됨)
-    def update(self, player, maze): # player 객체와 maze 리스트를 받도록 수정
-        if not self.can_move(maze):
+    def update(self, player, walkable): # player 객체와 walkable 비트맵을 받도록 수정
+        if not self.can_move(walkable):
             return
 
-        current_time = time.time()
-        
-        # 각 AI 타입에 따른 행동 로직 호출
-        if self.type == AIType.PATROL:
-            self._patrol_behavior(player.pos, player.is_stealthed(), maze)
-        elif self.type == AIType.DETECTOR:
-            self._detector_behavior(player.pos, player.is_stealthed(), maze)
-        elif self.type == AIType.ENHANCED:
-            self._enhanced_behavior(player, maze) # player 객체와 maze 리스트 전달
+        # 생성 시 정해 둔 타입별 행동 로직 호출
+        self._behave(player, walkable)
 
 
 class StarMazeGame:
@@ -400,6 +473,10 @@ class StarMazeGame:
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH_WITH_UI, SCREEN_HEIGHT))
         pygame.display.set_caption("Star Maze")
+        # 게임에서 처리하는 이벤트(종료, 키 누름)만 큐에 쌓이도록 해서 마우스 이동 등은 SDL 단계에서 버림
+        # (이동 키는 key.get_pressed()로 읽으므로 KEYUP 등을 막아도 키 상태는 그대로 갱신됨)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([_QUIT, _KEYDOWN])
         self.clock = pygame.time.Clock()
         # 폰트 파일 경로를 프로젝트 내 상대 경로로 변경합니다.
         font_path = "assets/fonts/NanumGothic-Regular.ttf"
@@ -414,10 +491,75 @@ class StarMazeGame:
             self.large_font = pygame.font.Font(None, 48)
             self.small_font = pygame.font.Font(None, 18)
 
+        # (폰트, 문자열, 색상) -> 렌더링된 글자 표면. UI 글자는 대부분 프레임마다 같으므로 재사용
+        self._text_cache = {}
+        self._star_sprites = {} # (색상, 크기) -> 미리 그려 둔 별 스프라이트
+        # AI 근접 경고 아이콘 (삼각형)은 경고 색상별로 미리 그려 둠
+        self.warning_icons = {}
+        for warning_color in (WARNING_RED, WARNING_YELLOW):
+            icon = pygame.Surface((21, 21), pygame.SRCALPHA).convert_alpha()
+            pygame.draw.polygon(icon, warning_color, [(10, 5), (0, 20), (20, 20)])
+            self.warning_icons[warning_color] = icon
+        # AI는 종류별 색상이 고정이므로 색상마다 원을 그린 타일 스프라이트를 미리 만들어 둠
+        self._ai_sprites = {}
+        for ai_color in (PATROL_AI_COLOR, DETECTOR_AI_COLOR, ENHANCED_AI_COLOR):
+            sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA).convert_alpha()
+            pygame.draw.circle(sprite, ai_color, (TILE_SIZE // 2, TILE_SIZE // 2), TILE_SIZE // 2 - 2)
+            self._ai_sprites[ai_color] = sprite
+        # 플레이어 스프라이트: 기본, 은신(어둡게), 무적(흰색 테두리)
+        player_sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(player_sprite, PLAYER_COLOR, (2, 2, TILE_SIZE - 4, TILE_SIZE - 4))
+        stealth_sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA).convert_alpha()
+        pygame.draw.rect(stealth_sprite, (PLAYER_COLOR[0] // 2, PLAYER_COLOR[1] // 2, PLAYER_COLOR[2] // 2),
+                         (2, 2, TILE_SIZE - 4, TILE_SIZE - 4))
+        invincible_sprite = player_sprite.copy()
+        pygame.draw.rect(invincible_sprite, (255, 255, 255), (0, 0, TILE_SIZE, TILE_SIZE), 2) # 테두리
+        self.player_sprite = player_sprite
+        self.player_stealth_sprite = stealth_sprite
+        self.player_invincible_sprite = invincible_sprite
+
+        # 게임 오버 화면: 반투명 덮개와 결과별 글자는 바뀌지 않으므로 한 번만 만들어 둠
+        self.game_over_overlay = pygame.Surface((SCREEN_WIDTH_WITH_UI, SCREEN_HEIGHT)).convert()
+        self.game_over_overlay.set_alpha(128)
+        self.game_over_overlay.fill((0, 0, 0))
+        self.game_over_texts = {}
+        for state, title, subtitle, color in (
+                (GameState.WON, "승리!", "별을 모두 모아 탈출했습니다!", (0, 255, 0)),
+                (GameState.LOST, "패배!", "다시 도전해보세요!", (255, 0, 0))):
+            title_text = self.large_font.render(title, True, color)
+            subtitle_text = self.font.render(subtitle, True, WHITE)
+            restart_text = self.font.render("R키를 눌러 다시 시작", True, WHITE)
+            self.game_over_texts[state] = [
+                (title_text, title_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 - 50))),
+                (subtitle_text, subtitle_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2))),
+                (restart_text, restart_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 + 50))),
+            ]
+        # 조작법 안내는 바뀌지 않으므로 시작할 때 한 번만 렌더링
+        controls = [
+            "조작법:",
+            "WASD/화살표: 이동",
+            "Shift: 스프린트",
+            "Space: 은신",
+            "",
+            "목표:",
+            "별 5개 수집 후",
+            "초록색 탈출구로!"
+        ]
+        self.control_surfaces = [self.small_font.render(control, True, WHITE) for control in controls]
+        # 오른쪽 UI 패널은 표시 내용이 바뀔 때만 다시 그리고 평소에는 이 표면을 복사
+        self.ui_panel = pygame.Surface((SCREEN_WIDTH_WITH_UI - MAZE_WIDTH * TILE_SIZE, SCREEN_HEIGHT)).convert()
+        self._ui_state = None # 패널을 마지막으로 그린 표시 내용
+
         self.state = GameState.MENU
         self.maze = []
+        self.walkable = None # 통과 가능 비트맵 (1이면 통로)
+        self.walkable_flat = None
+        self._walkable_bytes = b""
         self.player = None
-        self.stars = []
+        self.star_positions = {} # (x, y) -> 아직 수집하지 않은 별의 Position
+        self._stars_np = np.empty((0, 2), dtype=np.int32) # 남은 별 좌표 배열 (방향 계산용)
+        self._star_dir_key = None # 방향 목록을 마지막으로 계산한 (플레이어 x, y, 남은 별 수)
+        self._star_dirs = []
         self.exit_pos = None # 초기에는 None으로 설정
         self.minimap_item_pos = None # 미니맵 아이템 위치 추가
         self.minimap_active_until = 0 # 미니맵 활성화 종료 시간
@@ -425,44 +567,122 @@ class StarMazeGame:
         self.current_event = None # 현재 활성화된 이벤트 타입
         self.event_active_until = 0 # 이벤트 종료 시간
         self.ais = [] # AI 리스트 초기화
+        self._ai_cells = {} # (x, y) -> 그 칸에 있는 AI 목록 (매 틱 AI 이동 후 갱신)
+        self._min_ai_dist_sq = float('inf') # 가장 가까운 AI까지의 거리 제곱 (근접 경고용)
         self.start_time = 0
-        self.game_messages = [] # (message_text, start_time, duration) 튜플 리스트
-
+        self.now = time.time() # 현재 프레임 시각 (run 루프에서 프레임마다 한 번 갱신)
+        self.keys = None # 현재 프레임의 키 상태 (handle_input에서 갱신)
+        # (message_text, start_time, duration, surface) 튜플 큐, 화면에는 최근 메시지 몇 개만 유지
+        self.game_messages = deque(maxlen=MAX_GAME_MESSAGES)
+
+        # A* 탐색용 버퍼 (매 호출마다 딕셔너리를 새로 만들지 않고 재사용)
+        self._g = np.full((MAZE_HEIGHT, MAZE_WIDTH), np.inf, dtype=np.float32)
+        self._f = np.full((MAZE_HEIGHT, MAZE_WIDTH), np.inf, dtype=np.float32)
+        self._parent = np.full(MAZE_HEIGHT * MAZE_WIDTH, -1, dtype=np.int32) # y*W+x 인덱스의 부모 인덱스
+        self._visit_gen = np.zeros((MAZE_HEIGHT, MAZE_WIDTH), dtype=np.int32) # 칸을 마지막으로 갱신한 탐색 세대
+        self._astar_gen = 0 # 현재 탐색 세대 (값이 다르면 미방문으로 간주)
+
+        # 플레이어 기준 BFS 필드 (플레이어를 쫓는 모든 AI가 공유)
+        self._dist_field = np.full((MAZE_HEIGHT, MAZE_WIDTH), -1, dtype=np.int32) # 플레이어까지의 칸 수
+        self._parent_field = np.full((MAZE_HEIGHT, MAZE_WIDTH), -1, dtype=np.int8) # 플레이어 쪽 NEIGHBORS4 방향
+        self.field_origin = None # 필드를 계산한 플레이어 위치
+
+        # 칸별 좌표 격자 (벡터화된 거리 계산용)
+        self._grid_ys, self._grid_xs = np.mgrid[:MAZE_HEIGHT, :MAZE_WIDTH]
+
+        # 미로/안개 렌더링용 표면 (타일마다 사각형을 그리는 대신 몇 번의 blit으로 처리)
+        self.maze_surface = None # init_game에서 미로 생성 후 한 번 그림
+        # 미리 칠해 둔 타일 (draw.rect 대신 blit으로 찍음)
+        self.wall_tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        self.wall_tile.fill(WALL_COLOR)
+        self.floor_tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        self.floor_tile.fill(BLACK)
+        # 안개는 "덮임/보임" 두 가지뿐이므로 픽셀별 알파 대신 컬러키로 투명 처리 (알파 블렌딩보다 blit이 빠름)
+        self.fog_surface = pygame.Surface((MAZE_WIDTH * TILE_SIZE, MAZE_HEIGHT * TILE_SIZE)).convert()
+        self.fog_surface.set_colorkey(FOG_HOLE_KEY)
+        self._fog_key = None # fog_surface를 마지막으로 만든 (맵 어두워짐 여부, 플레이어 x, y)
+        self._fog_hole_rect = None # fog_surface에서 마지막으로 뚫은 영역 (다음 갱신 때 이 부분만 다시 덮음)
+        # 시야 마스크: 반경 안의 타일은 컬러키, 나머지는 안개색 (안개 위에 그대로 덮으면 구멍이 뚫림)
+        vision_size = (2 * VISION_RADIUS + 1) * TILE_SIZE
+        self.vision_cutout = pygame.Surface((vision_size, vision_size)).convert()
+        self.vision_cutout.fill(FOG_COLOR)
+        hole_tile = pygame.Surface((TILE_SIZE, TILE_SIZE)).convert()
+        hole_tile.fill(FOG_HOLE_KEY)
+        # 시야 원 안의 칸은 배열 연산으로 한 번에 골라냄
+        offset_ys, offset_xs = np.indices((2 * VISION_RADIUS + 1, 2 * VISION_RADIUS + 1)) - VISION_RADIUS
+        vision_mask = offset_xs ** 2 + offset_ys ** 2 <= VISION_RADIUS_SQ
+        self.vision_cutout.blits([(hole_tile, (int(x) * TILE_SIZE, int(y) * TILE_SIZE))
+                                  for y, x in np.argwhere(vision_mask)], doreturn=False)
+
+    def render_text(self, font, text, color):
+        """글자 표면을 캐시에서 찾아 반환하고, 없으면 렌더링해서 캐시에 넣습니다."""
+        key = (font, text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            if len(self._text_cache) >= TEXT_CACHE_SIZE:
+                self._text_cache.clear() # 남은 시간처럼 계속 바뀌는 문자열이 쌓이지 않도록 비움
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
 
     def add_game_message(self, text, duration=2.0):
         """게임 화면에 표시될 메시지를 추가합니다."""
-        self.game_messages.append((text, time.time(), duration))
+        # 글자 렌더링은 느리므로 메시지를 추가할 때 한 번만 렌더링해 둠
+        message_surface = self.font.render(text, True, (255, 255, 255))
+        self.game_messages.append((text, self.now, duration, message_surface))
 
     def draw_game_messages(self):
         """현재 활성화된 게임 메시지를 화면에 그립니다."""
-        current_time = time.time()
-        active_messages = []
+        current_time = self.now
+        messages = self.game_messages
+
+        # 메시지는 추가된 순서대로 쌓이므로 앞쪽부터 만료된 메시지를 제거
+        while messages and current_time >= messages[0][1] + messages[0][2]:
+            messages.popleft()
         
         y_offset = SCREEN_HEIGHT - 50 # 화면 하단에서부터 메시지 표시 시작
 
-        for i, (text, start_time, duration) in enumerate(self.game_messages):
-            if current_time < start_time + duration:
-                # 메시지 투명도 조절 (사라지기 직전에 서서히 투명해짐)
-                alpha = 255
-                fade_start_time = start_time + duration - 0.5 # 사라지기 0.5초 전부터 페이드 시작
-                if current_time > fade_start_time:
-                    alpha = int(255 * (1 - (current_time - fade_start_time) / 0.5))
-                alpha = max(0, alpha) # 0 미만으로 내려가지 않게
-
-                message_surface = self.font.render(text, True, (255, 255, 255))
-                message_surface.set_alpha(alpha)
-                
-                text_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
-                self.screen.blit(message_surface, text_rect)
-                y_offset -= 30 # 다음 메시지를 위해 위로 이동
-                active_messages.append((text, start_time, duration))
-        
-        self.game_messages = active_messages # 활성화된 메시지만 남김
+        for text, start_time, duration, message_surface in messages:
+            if current_time >= start_time + duration:
+                continue # 앞 메시지보다 지속 시간이 짧아 먼저 끝난 메시지
+            
+            # 메시지 투명도 조절 (사라지기 직전에 서서히 투명해짐)
+            alpha = 255
+            fade_start_time = start_time + duration - 0.5 # 사라지기 0.5초 전부터 페이드 시작
+            if current_time > fade_start_time:
+                alpha = int(255 * (1 - (current_time - fade_start_time) / 0.5))
+            alpha = max(0, alpha) # 0 미만으로 내려가지 않게
+
+            message_surface.set_alpha(alpha)
+            
+            text_rect = message_surface.get_rect(center=(SCREEN_WIDTH // 2, y_offset))
+            self.screen.blit(message_surface, text_rect)
+            y_offset -= 30 # 다음 메시지를 위해 위로 이동
 
     def init_game(self):
         """게임 초기화"""
         maze_gen = MazeGenerator(MAZE_WIDTH, MAZE_HEIGHT)
         self.maze = maze_gen.generate()
+        # 통과 가능 여부를 미리 계산한 비트맵 (walkable[y, x]가 1이면 통로)
+        self.walkable = np.asarray(self.maze, dtype=np.uint8) ^ 1
+        self.walkable_flat = self.walkable.ravel() # y*W+x 인덱스용 평탄화 뷰
+        # 파이썬 루프 안의 스칼라 조회는 numpy 인덱싱보다 bytes 인덱싱이 빠름
+        self._walkable_bytes = self.walkable_flat.tobytes()
+        self._passable_idx = np.flatnonzero(self.walkable_flat) # 통로 칸의 y*W+x 인덱스 목록
+        # 통로 칸 좌표 목록 (게임 도중 빈 칸을 찾을 때 미로 전체를 다시 훑지 않도록 미리 만들어 둠)
+        self._floor_cells = [(int(i % MAZE_WIDTH), int(i // MAZE_WIDTH)) for i in self._passable_idx]
+        # 통로 칸을 8x8 타일 단위 버킷으로 묶은 공간 색인 ((bx, by) -> 칸 좌표 목록)
+        self._floor_buckets = {}
+        for x, y in self._floor_cells:
+            self._floor_buckets.setdefault((x >> FLOOR_BUCKET_SHIFT, y >> FLOOR_BUCKET_SHIFT), []).append((x, y))
+        self.field_origin = None # 새 미로이므로 BFS 필드 무효화
+        # 벽은 게임 중 바뀌지 않으므로 미로 전체를 한 번만 그려 둠
+        self.maze_surface = pygame.Surface((MAZE_WIDTH * TILE_SIZE, MAZE_HEIGHT * TILE_SIZE)).convert()
+        # 타일마다 blit을 호출하지 않고 목록을 만들어 한 번에 넘김 (칸 종류는 walkable 배열에서 읽음)
+        tiles = (self.wall_tile, self.floor_tile) # walkable 값(0: 벽, 1: 통로)으로 인덱싱
+        self.maze_surface.blits([(tiles[cell], (x * TILE_SIZE, y * TILE_SIZE))
+                                 for y, row in enumerate(self.walkable.tolist())
+                                 for x, cell in enumerate(row)], doreturn=False)
         self.player = Player(1, 1) # 플레이어 시작 위치
         self.player.set_game_instance(self) # 플레이어에게 게임 인스턴스 전달
         self.exit_pos = None # 게임 시작 시 출구는 생성되지 않음
@@ -471,84 +691,94 @@ class StarMazeGame:
         self.event_box_pos = None # 이벤트 상자 위치 초기화
         self.current_event = None # 현재 이벤트 초기화
         self.event_active_until = 0 # 이벤트 종료 시간 초기화
+        # 배치 후보 계산용: 아직 아무것도 놓이지 않은 통로 칸과 시작점으로부터의 거리 제곱
+        self._spawn_free = self.walkable.astype(bool)
+        self._spawn_dist_sq = ((self._grid_xs - self.player.pos.x) ** 2 +
+                               (self._grid_ys - self.player.pos.y) ** 2)
         self.generate_stars()
         self.generate_minimap_item() # 미니맵 아이템 생성 호출
         self.generate_event_box() # 이벤트 상자 생성 호출
         self.ais = [] # AI 리스트 초기화
+        self._ai_cells = {}
+        self._min_ai_dist_sq = float('inf')
         self.create_ais() # AI 생성
-        self.start_time = time.time()
+        self.start_time = self.now
         self.state = GameState.PLAYING
-        self.game_messages = [] # 새 게임 시작 시 메시지 초기화
+        self.game_messages.clear() # 새 게임 시작 시 메시지 초기화
         self.add_game_message("별 미로에 오신 것을 환영합니다!") # 시작 메시지
         self.add_game_message("별 5개를 모아 탈출구를 소환하세요!", duration=3.0)
 
+    def _take_spawn_cells(self, candidates, count) -> List[Position]:
+        """
+        후보 마스크에서 칸을 무작위로 골라 사용 처리하고 Position 리스트로 반환합니다.
+        :param candidates: (H, W) bool 배열, True인 칸이 후보
+        :param count: 고를 칸 수 (후보가 부족하면 있는 만큼만)
+        """
+        indices = np.flatnonzero(candidates)
+        if len(indices) == 0:
+            return []
+        chosen = np.random.choice(indices, min(count, len(indices)), replace=False)
+        self._spawn_free.ravel()[chosen] = False # 다른 아이템과 겹치지 않도록 사용 처리
+        return [Position(int(i % MAZE_WIDTH), int(i // MAZE_WIDTH)) for i in chosen]
+
+    def floor_cells_far_from(self, px, py, min_dist_sq):
+        """
+        (px, py)에서 거리 제곱이 min_dist_sq보다 먼 통로 칸 좌표 목록을 반환합니다.
+        버킷 전체가 가깝거나 멀면 칸마다 거리를 계산하지 않고 통째로 건너뛰거나 포함합니다.
+        """
+        size = 1 << FLOOR_BUCKET_SHIFT
+        cells = []
+        for (bx, by), bucket in self._floor_buckets.items():
+            x0, y0 = bx * size, by * size
+            x1, y1 = x0 + size - 1, y0 + size - 1
+            # 버킷 사각형까지의 최소/최대 축 거리
+            near_x = x0 - px if px < x0 else (px - x1 if px > x1 else 0)
+            near_y = y0 - py if py < y0 else (py - y1 if py > y1 else 0)
+            far_x = max(px - x0, x1 - px)
+            far_y = max(py - y0, y1 - py)
+            if far_x * far_x + far_y * far_y <= min_dist_sq:
+                continue # 버킷 전체가 너무 가까움
+            if near_x * near_x + near_y * near_y > min_dist_sq:
+                cells.extend(bucket) # 버킷 전체가 충분히 멂
+                continue
+            cells.extend((x, y) for x, y in bucket
+                         if (x - px) * (x - px) + (y - py) * (y - py) > min_dist_sq)
+        return cells
+
+    def random_passable_cell(self) -> Position:
+        """통로 칸 하나를 무작위로 골라 반환합니다 (벽에 걸리면 다시 뽑는 반복 없이 한 번에)."""
+        i = int(self._passable_idx[np.random.randint(len(self._passable_idx))])
+        y, x = divmod(i, MAZE_WIDTH)
+        return Position(x, y)
+
     def generate_stars(self):
         """별 5개를 미로의 빈 공간에 무작위로 배치"""
-        empty_spaces = []
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                # 플레이어 시작점 주변은 피하고, 탈출구 위치(미생성 상태)는 고려하지 않음
-                if (self.maze[y][x] == 0 and 
-                    Position(x, y).distance_to(self.player.pos) > 5): # 플레이어 시작점에서 충분히 멀리
-                    empty_spaces.append(Position(x, y))
-        
-        self.stars = random.sample(empty_spaces, min(5, len(empty_spaces)))
+        # 플레이어 시작점 주변은 피하고, 탈출구 위치(미생성 상태)는 고려하지 않음
+        stars = self._take_spawn_cells(self._spawn_free & (self._spawn_dist_sq > 5 * 5), 5)
+        # 수집 판정을 칸 좌표 조회 한 번으로 끝내기 위해 좌표를 키로 보관
+        self.star_positions = {(star.x, star.y): star for star in stars}
+        self._update_star_array()
+
+    def _update_star_array(self):
+        """남은 별 좌표를 (N, 2) 배열로 다시 만들고 방향 캐시를 무효화합니다."""
+        self._stars_np = np.array(list(self.star_positions), dtype=np.int32).reshape(-1, 2)
+        self._star_dir_key = None
     
     def generate_minimap_item(self):
         """미니맵 아이템을 미로의 빈 공간에 무작위로 배치"""
-        empty_spaces = []
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                # 플레이어 시작점, 별 위치 등을 고려하여 배치
-                is_clear = True
-                current_pos = Position(x, y)
-                if (self.maze[y][x] == 1 or 
-                    current_pos == self.player.pos or 
-                    current_pos.distance_to(self.player.pos) < 8): # 플레이어 시작점과 충분히 멀리
-                    is_clear = False
-                
-                # 생성된 별 위치와도 겹치지 않게
-                for star in self.stars:
-                    if current_pos == star:
-                        is_clear = False
-                        break
-                
-                if is_clear:
-                    empty_spaces.append(current_pos)
-        
-        if empty_spaces:
+        # 플레이어 시작점과 충분히 멀리, 별 위치와는 겹치지 않게 (_spawn_free에서 이미 제외됨)
+        chosen = self._take_spawn_cells(self._spawn_free & (self._spawn_dist_sq >= 8 * 8), 1)
+        if chosen:
             # 적절한 위치에 아이템 하나만 배치
-            self.minimap_item_pos = random.choice(empty_spaces)
+            self.minimap_item_pos = chosen[0]
             self.add_game_message("미니맵 아이템이 생성되었습니다!", duration=2.5)
 
     def generate_event_box(self):
         """이벤트 상자를 미로의 빈 공간에 무작위로 배치"""
-        empty_spaces = []
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                is_clear = True
-                current_pos = Position(x, y)
-                # 플레이어 시작점, 별, 미니맵 아이템 위치와 겹치지 않게
-                if (self.maze[y][x] == 1 or 
-                    current_pos == self.player.pos or 
-                    current_pos.distance_to(self.player.pos) < 10): # 플레이어 시작점에서 충분히 멀리
-                    is_clear = False
-                
-                # 생성된 별 위치와도 겹치지 않게
-                for star in self.stars:
-                    if current_pos == star:
-                        is_clear = False
-                        break
-                
-                # 미니맵 아이템 위치와도 겹치지 않게
-                if self.minimap_item_pos and current_pos == self.minimap_item_pos:
-                    is_clear = False
-                
-                if is_clear:
-                    empty_spaces.append(current_pos)
-        
-        if empty_spaces:
-            self.event_box_pos = random.choice(empty_spaces)
+        # 플레이어 시작점에서 충분히 멀리, 별/미니맵 아이템 위치와는 겹치지 않게
+        chosen = self._take_spawn_cells(self._spawn_free & (self._spawn_dist_sq >= 10 * 10), 1)
+        if chosen:
+            self.event_box_pos = chosen[0]
             self.add_game_message("미스터리 상자가 생성되었습니다!", duration=2.5)
         
     def activate_random_event(self):
@@ -557,7 +787,7 @@ class StarMazeGame:
         chosen_event = random.choice(event_types)
         
         self.current_event = chosen_event
-        self.event_active_until = time.time() + 5.0 # 모든 이벤트는 5초 지속 (임의 설정)
+        self.event_active_until = self.now + 5.0 # 모든 이벤트는 5초 지속 (임의 설정)
 
         event_message = ""
         if chosen_event == EventType.INVINCIBLE:
@@ -595,92 +825,151 @@ class StarMazeGame:
 
     def create_ais(self):
         """AI들을 생성하고 초기 위치 설정"""
-        empty_spaces = []
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                # 플레이어 시작 위치, 미니맵 아이템 위치, 이벤트 상자 위치와 겹치지 않게
-                is_clear = True
-                current_pos = Position(x, y)
-                if (self.maze[y][x] == 1 or 
-                    current_pos.distance_to(self.player.pos) < 5 or # 플레이어 근처 피하기
-                    (self.minimap_item_pos and current_pos == self.minimap_item_pos) or # 미니맵 아이템 위치 피하기
-                    (self.event_box_pos and current_pos == self.event_box_pos) or # 이벤트 상자 위치 피하기
-                    current_pos.distance_to(self.player.pos) > MAZE_WIDTH * 0.7 # 너무 먼 곳도 피해서 AI들이 초반부터 보일 가능성 높임
-                    ):
-                    is_clear = False
-                
-                if is_clear:
-                    empty_spaces.append(current_pos)
+        # 플레이어 근처는 피하고, 너무 먼 곳도 피해서 AI들이 초반부터 보일 가능성 높임
+        # (미니맵 아이템, 이벤트 상자 등 이미 배치된 칸은 _spawn_free에서 제외됨)
+        candidates = (self._spawn_free &
+                      (self._spawn_dist_sq >= 5 * 5) &
+                      (self._spawn_dist_sq <= (MAZE_WIDTH * 0.7) ** 2))
         
         # 최소 2개의 AI가 생성될 수 있도록 충분한 공간 확보 확인
-        if len(empty_spaces) >= 2: 
+        if np.count_nonzero(candidates) >= 2: 
+            patrol_pos, detector_pos = self._take_spawn_cells(candidates, 2)
+
             # 순찰 AI 생성
-            patrol_pos = random.choice(empty_spaces)
             patrol_ai = AI(patrol_pos.x, patrol_pos.y, AIType.PATROL, self)
             patrol_path = self.generate_patrol_path(patrol_pos) # 순찰 AI는 순찰 경로 가짐
             patrol_ai.set_patrol_path(patrol_path)
             self.ais.append(patrol_ai)
-            empty_spaces.remove(patrol_pos) # 사용된 위치 제거
 
             # 탐지 AI 생성
-            detector_pos = random.choice(empty_spaces)
             detector_ai = AI(detector_pos.x, detector_pos.y, AIType.DETECTOR, self)
             self.ais.append(detector_ai)
-            empty_spaces.remove(detector_pos) # 사용된 위치 제거
 
 
     def find_path_astar(self, start_pos: Position, end_pos: Position) -> List[Position]:
         """A* 알고리즘을 사용해 start_pos에서 end_pos까지의 최단 경로를 찾습니다."""
-        
-        def heuristic(a, b):
-            # 맨해튼 거리 휴리스틱 함수
-            return abs(a.x - b.x) + abs(a.y - b.y)
+        if not NUMBA_AVAILABLE:
+            # numba를 쓸 수 없는 환경(웹 배포 등)에서는 파이썬 구현 사용
+            return self._find_path_astar_py(start_pos, end_pos)
+
+        parent = astar_core(self.walkable, MAZE_WIDTH, MAZE_HEIGHT,
+                            start_pos.x, start_pos.y, end_pos.x, end_pos.y)
+        start_idx = start_pos.y * MAZE_WIDTH + start_pos.x
+        end_idx = end_pos.y * MAZE_WIDTH + end_pos.x
+        if parent[end_idx] < 0:
+            return [] # 경로를 찾지 못했거나 시작점과 목표가 같은 경우
+        return self._rebuild_path(parent, start_idx, end_idx)
+
+    def _rebuild_path(self, parent, start_idx, end_idx) -> List[Position]:
+        """부모 인덱스 배열을 목표에서 거꾸로 따라가며 경로를 복원합니다 (Position은 여기서만 생성)."""
+        path = []
+        current = end_idx
+        while current != start_idx:
+            cy, cx = divmod(current, MAZE_WIDTH)
+            path.append(Position(cx, cy))
+            current = int(parent[current])
+        path.reverse()
+        return path
 
-        open_set = []
-        heapq.heappush(open_set, (0, start_pos)) # (f_score, position)
+    def _find_path_astar_py(self, start_pos: Position, end_pos: Position) -> List[Position]:
+        """numba 커널을 쓸 수 없을 때 사용하는 파이썬 A* 구현입니다."""
         
-        came_from = {}
-        # 딕셔너리 키로 Position 객체 대신 튜플 (x, y) 사용
-        g_score = {(x, y): float('inf') for y in range(MAZE_HEIGHT) for x in range(MAZE_WIDTH)}
-        g_score[(start_pos.x, start_pos.y)] = 0
-        
-        f_score = {(x, y): float('inf') for y in range(MAZE_HEIGHT) for x in range(MAZE_WIDTH)}
-        f_score[(start_pos.x, start_pos.y)] = heuristic(start_pos, end_pos)
-
-        open_set_hash = {(start_pos.x, start_pos.y)}
+        # 호출마다 세대 번호를 올려, 버퍼를 다시 채우지 않고도 이전 탐색 값을 무효화합니다.
+        self._astar_gen += 1
+        gen = self._astar_gen
+        g_score = self._g
+        f_score = self._f
+        parent = self._parent
+        visit_gen = self._visit_gen
+        walkable = self._walkable_bytes
+
+        end_x, end_y = end_pos.x, end_pos.y
+        start_idx = start_pos.y * MAZE_WIDTH + start_pos.x
+        end_idx = end_y * MAZE_WIDTH + end_x
+
+        # 맨해튼 거리 휴리스틱
+        start_f = abs(start_pos.x - end_x) + abs(start_pos.y - end_y)
+        visit_gen[start_pos.y, start_pos.x] = gen
+        g_score[start_pos.y, start_pos.x] = 0
+        f_score[start_pos.y, start_pos.x] = start_f
+        parent[start_idx] = -1
+
+        # Position 대신 y*W+x 정수 인덱스를 힙에 넣어 비교 비용을 줄입니다.
+        open_set = [(start_f, start_idx)] # (f_score, index)
 
         while open_set:
-            _, current = heapq.heappop(open_set) 
-            open_set_hash.remove((current.x, current.y))
+            current_f, current = heapq.heappop(open_set)
+            cy, cx = divmod(current, MAZE_WIDTH)
 
-            if current.x == end_pos.x and current.y == end_pos.y : 
-                path = []
-                while (current.x, current.y) in came_from:
-                    path.append(current)
-                    current = came_from[(current.x, current.y)]
-                path.reverse()
-                return path
+            # 더 좋은 경로로 갱신된 칸의 오래된 항목은 건너뜀 (지연 삭제)
+            if current_f != f_score[cy, cx]:
+                continue
 
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                neighbor = Position(current.x + dx, current.y + dy)
+            if current == end_idx:
+                return self._rebuild_path(parent, start_idx, end_idx)
 
-                if not (0 <= neighbor.x < MAZE_WIDTH and 0 <= neighbor.y < MAZE_HEIGHT):
+            tentative_g_score = g_score[cy, cx] + 1
+
+            for dx, dy in NEIGHBORS4:
+                nx, ny = cx + dx, cy + dy
+
+                if not (0 <= nx < MAZE_WIDTH and 0 <= ny < MAZE_HEIGHT):
                     continue
-                if self.maze[neighbor.y][neighbor.x] == 1:
+                neighbor = ny * MAZE_WIDTH + nx
+                if not walkable[neighbor]:
                     continue
 
-                tentative_g_score = g_score.get((current.x, current.y), float('inf')) + 1
-
-                if tentative_g_score < g_score.get((neighbor.x, neighbor.y), float('inf')):
-                    came_from[(neighbor.x, neighbor.y)] = current
-                    g_score[(neighbor.x, neighbor.y)] = tentative_g_score
-                    f_score[(neighbor.x, neighbor.y)] = tentative_g_score + heuristic(neighbor, end_pos)
-                    if (neighbor.x, neighbor.y) not in open_set_hash:
-                        heapq.heappush(open_set, (f_score[(neighbor.x, neighbor.y)], neighbor))
-                        open_set_hash.add((neighbor.x, neighbor.y))
+                if visit_gen[ny, nx] != gen or tentative_g_score < g_score[ny, nx]:
+                    visit_gen[ny, nx] = gen
+                    parent[neighbor] = current
+                    g_score[ny, nx] = tentative_g_score
+                    neighbor_f = tentative_g_score + abs(nx - end_x) + abs(ny - end_y)
+                    f_score[ny, nx] = neighbor_f
+                    heapq.heappush(open_set, (neighbor_f, neighbor))
         
         return [] # 경로를 찾지 못한 경우
     
+    def update_player_field(self):
+        """플레이어 위치에서 BFS를 수행해 거리/방향 필드를 갱신합니다 (플레이어가 움직였을 때만)."""
+        origin = self.player.pos
+        if origin == self.field_origin:
+            return
+
+        if NUMBA_AVAILABLE:
+            bfs_core(self.walkable, MAZE_WIDTH, MAZE_HEIGHT, origin.x, origin.y,
+                     self._dist_field, self._parent_field)
+        else:
+            walkable = self._walkable_bytes
+            dist = [-1] * (MAZE_WIDTH * MAZE_HEIGHT)
+            step = [-1] * (MAZE_WIDTH * MAZE_HEIGHT)
+            origin_idx = origin.y * MAZE_WIDTH + origin.x
+            if walkable[origin_idx]: # 벽 통과 중이라 벽 안에 있으면 도달 불가
+                dist[origin_idx] = 0
+                queue = deque([origin_idx])
+                while queue:
+                    current = queue.popleft()
+                    cy, cx = divmod(current, MAZE_WIDTH)
+                    for d, (dx, dy) in enumerate(NEIGHBORS4):
+                        nx, ny = cx + dx, cy + dy
+                        if not (0 <= nx < MAZE_WIDTH and 0 <= ny < MAZE_HEIGHT):
+                            continue
+                        neighbor = ny * MAZE_WIDTH + nx
+                        if walkable[neighbor] and dist[neighbor] < 0:
+                            dist[neighbor] = dist[current] + 1
+                            step[neighbor] = (d + 2) & 3 # 들어온 방향의 반대쪽이 플레이어 쪽
+                            queue.append(neighbor)
+            self._dist_field.ravel()[:] = dist
+            self._parent_field.ravel()[:] = step
+
+        self.field_origin = origin
+
+    def next_step_to_player(self, pos: Position):
+        """BFS 필드를 따라 pos에서 플레이어 쪽으로 한 칸 이동한 위치를 반환합니다 (도달 불가면 None)."""
+        if self._dist_field[pos.y, pos.x] <= 0:
+            return None
+        dx, dy = NEIGHBORS4[self._parent_field[pos.y, pos.x]]
+        return Position(pos.x + dx, pos.y + dy)
+
     def generate_patrol_path(self, start_pos):
         """AI를 위한 순찰 경로 생성"""
         path = [start_pos]
@@ -688,10 +977,10 @@ class StarMazeGame:
         
         for _ in range(8):  # 8개 포인트의 순찰 경로
             possible_moves = []
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
+            for dx, dy in NEIGHBORS4:
                 new_x, new_y = current.x + dx*3, current.y + dy*3
                 if (0 <= new_x < MAZE_WIDTH and 0 <= new_y < MAZE_HEIGHT and
-                    self.maze[new_y][new_x] == 0):
+                    self.walkable[new_y, new_x]):
                     possible_moves.append(Position(new_x, new_y))
             
             if possible_moves:
@@ -710,25 +999,26 @@ class StarMazeGame:
         # 미로 테두리 한 칸 안쪽 (실질적인 가장자리 통로)
         # 상단 가장자리
         for x in range(1, MAZE_WIDTH - 1): 
-            if self.maze[1][x] == 0: 
+            if self.walkable[1, x]: 
                 possible_exit_points.append(Position(x, 1))
         # 하단 가장자리
         for x in range(1, MAZE_WIDTH - 1): 
-            if self.maze[MAZE_HEIGHT - 2][x] == 0: 
+            if self.walkable[MAZE_HEIGHT - 2, x]: 
                 possible_exit_points.append(Position(x, MAZE_HEIGHT - 2))
         # 좌측 가장자리
         for y in range(1, MAZE_HEIGHT - 1): 
-            if self.maze[y][1] == 0: 
+            if self.walkable[y, 1]: 
                 possible_exit_points.append(Position(1, y))
         # 우측 가장자리
         for y in range(1, MAZE_HEIGHT - 1): 
-            if self.maze[y][MAZE_WIDTH - 2] == 0: 
+            if self.walkable[y, MAZE_WIDTH - 2]: 
                 possible_exit_points.append(Position(MAZE_WIDTH - 2, y))
 
         # 플레이어 위치 근처는 피합니다.
+        min_exit_dist_sq = (VISION_RADIUS + 3) ** 2 # 시야 반경보다 더 멀리
         safe_exit_points = [
             p for p in possible_exit_points 
-            if p.distance_to(self.player.pos) > VISION_RADIUS + 3 # 시야 반경보다 더 멀리
+            if p.distance_sq(self.player.pos) > min_exit_dist_sq
         ]
         
         if safe_exit_points:
@@ -745,60 +1035,52 @@ class StarMazeGame:
 
     def get_star_directions(self):
         """수집하지 않은 별들의 방향 정보 반환"""
-        directions = []
-        player_pos = self.player.pos
-        
-        for star in self.stars:
-            dx = star.x - player_pos.x
-            dy = star.y - player_pos.y
-            
-            # 8방향으로 방향 결정
-            if abs(dx) > abs(dy):
-                if dx > 0:
-                    direction = "동쪽" if abs(dy) < abs(dx)/2 else ("남동쪽" if dy > 0 else "북동쪽")
-                else:
-                    direction = "서쪽" if abs(dy) < abs(dx)/2 else ("남서쪽" if dy > 0 else "북서쪽")
-            else:
-                if dy > 0:
-                    direction = "남쪽" if abs(dx) < abs(dy)/2 else ("남동쪽" if dx > 0 else "남서쪽")
-                else:
-                    direction = "북쪽" if abs(dx) < abs(dy)/2 else ("북동쪽" if dx > 0 else "북서쪽")
-            
-            directions.append(direction)
-        
-        return directions
+        px, py = self.player.pos.x, self.player.pos.y
+        # 방향은 플레이어가 움직이거나 별을 수집했을 때만 바뀌므로 그때만 다시 계산
+        key = (px, py, len(self._stars_np))
+        if key != self._star_dir_key:
+            offsets = self._stars_np - (px, py)
+            # 각도를 45도 단위로 양자화해 8방위 인덱스로 변환 (화면 y축은 아래가 +이므로 부호 반전)
+            angles = np.arctan2(-offsets[:, 1], offsets[:, 0])
+            indices = ((angles + np.pi) / (np.pi / 4) + 0.5).astype(np.int64) & 7
+            self._star_dirs = [STAR_DIRECTIONS[i] for i in indices.tolist()]
+            self._star_dir_key = key
+        return self._star_dirs
     
     def handle_input(self):
         keys = pygame.key.get_pressed()
+        self.keys = keys # 프레임당 한 번만 조회해 Player.move에서도 재사용
         
         if self.state == GameState.PLAYING:
             moved = False
-            sprint_active = keys[pygame.K_LSHIFT] and self.player.sprint_cooldown <= 0
+            sprint_active = keys[_K_LSHIFT] and self.player.sprint_cooldown <= 0
+            move = self.player.move
+            walkable = self.walkable
             
             # 플레이어 이동 입력 처리
-            if keys[pygame.K_w] or keys[pygame.K_UP]:
-                moved = self.player.move(0, -1, self.maze)
-            elif keys[pygame.K_s] or keys[pygame.K_DOWN]:
-                moved = self.player.move(0, 1, self.maze)
-            elif keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                moved = self.player.move(-1, 0, self.maze)
-            elif keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                moved = self.player.move(1, 0, self.maze)
+            if keys[_K_W] or keys[_K_UP]:
+                moved = move(0, -1, walkable)
+            elif keys[_K_S] or keys[_K_DOWN]:
+                moved = move(0, 1, walkable)
+            elif keys[_K_A] or keys[_K_LEFT]:
+                moved = move(-1, 0, walkable)
+            elif keys[_K_D] or keys[_K_RIGHT]:
+                moved = move(1, 0, walkable)
             
             # 스프린트 활성화 및 이동 시 쿨다운 적용
             if sprint_active and moved:
-                self.player.sprint_cooldown = time.time() + 3.0  # 3초 쿨다운
+                self.player.sprint_cooldown = self.now + 3.0  # 3초 쿨다운
         
     def handle_events(self):
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+            if event.type == _QUIT:
                 return False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and self.state == GameState.PLAYING:
+            elif event.type == _KEYDOWN:
+                if event.key == _K_SPACE and self.state == GameState.PLAYING:
                     self.player.activate_stealth()
-                elif event.key == pygame.K_r and self.state in [GameState.WON, GameState.LOST]:
+                elif event.key == _K_R and self.state in [GameState.WON, GameState.LOST]:
                     self.init_game()
-                elif event.key == pygame.K_RETURN and self.state == GameState.MENU:
+                elif event.key == _K_RETURN and self.state == GameState.MENU:
                     self.init_game()
         
         return True
@@ -807,36 +1089,39 @@ class StarMazeGame:
         if self.state != GameState.PLAYING:
             return
         
-        current_time = time.time()
+        current_time = self.now
         
         # 시간 제한 확인
         if current_time - self.start_time > GAME_TIME_LIMIT:
             self.state = GameState.LOST
             return
         
-        # 별 수집 확인
-        for star in self.stars[:]: # 리스트 복사본을 사용하여 반복 중 삭제 가능
-            if self.player.pos.x == star.x and self.player.pos.y == star.y:
-                self.stars.remove(star)
-                self.player.stars_collected += 1
-                self.add_game_message(f"별 획득! ({self.player.stars_collected}/5)")
-                
-                # 3개 이상 수집 시 강화 AI 생성 (이미 생성되지 않은 경우)
-                if self.player.stars_collected == 3 and not any(ai.type == AIType.ENHANCED for ai in self.ais):
-                    self.spawn_enhanced_ai()
-                
-                # 별 5개 모두 수집 시 탈출구 생성
-                if self.player.stars_collected == 5 and self.exit_pos is None:
-                    self.generate_exit_point() # 탈출구 생성 함수 호출
+        player_x, player_y = self.player.pos.x, self.player.pos.y
+
+        # 별 수집 확인 (플레이어 칸에 별이 있으면 꺼냄)
+        if self.star_positions.pop((player_x, player_y), None) is not None:
+            self._update_star_array()
+            self.player.stars_collected += 1
+            self.add_game_message(f"별 획득! ({self.player.stars_collected}/5)")
+            
+            # 3개 이상 수집 시 강화 AI 생성 (이미 생성되지 않은 경우)
+            if self.player.stars_collected == 3 and not any(ai.type == AIType.ENHANCED for ai in self.ais):
+                self.spawn_enhanced_ai()
+            
+            # 별 5개 모두 수집 시 탈출구 생성
+            if self.player.stars_collected == 5 and self.exit_pos is None:
+                self.generate_exit_point() # 탈출구 생성 함수 호출
 
         # 미니맵 아이템 획득 확인
-        if self.minimap_item_pos and self.player.pos == self.minimap_item_pos:
+        minimap_item_pos = self.minimap_item_pos
+        if minimap_item_pos and player_x == minimap_item_pos.x and player_y == minimap_item_pos.y:
             self.minimap_active_until = current_time + 5.0 # 5초간 미니맵 활성화
             self.minimap_item_pos = None # 아이템 제거
             self.add_game_message("미니맵 활성화! 5초간 전체 지도가 보입니다!", duration=3.0)
 
         # 이벤트 상자 획득 확인
-        if self.event_box_pos and self.player.pos == self.event_box_pos:
+        event_box_pos = self.event_box_pos
+        if event_box_pos and player_x == event_box_pos.x and player_y == event_box_pos.y:
             self.event_box_pos = None # 상자 제거
             self.activate_random_event() # 랜덤 이벤트 활성화
 
@@ -848,36 +1133,42 @@ class StarMazeGame:
         # 플레이어가 별 5개를 모두 모았고, 탈출구가 생성되었으며, 플레이어가 탈출구 위치에 도달했을 때
         if (self.player.stars_collected == 5 and 
             self.exit_pos is not None and # 탈출구가 생성되었는지 확인
-            self.player.pos.x == self.exit_pos.x and 
-            self.player.pos.y == self.exit_pos.y):
+            player_x == self.exit_pos.x and 
+            player_y == self.exit_pos.y):
             self.state = GameState.WON
             return
             
-        # AI 업데이트
+        # AI 업데이트 (플레이어 추적용 BFS 필드는 AI들이 공유하므로 한 번만 계산)
+        self.update_player_field()
+        # 이동한 AI를 칸별로 모으면서 가장 가까운 AI까지의 거리도 함께 갱신
+        ai_cells = {}
+        min_ai_dist_sq = float('inf')
         for ai in self.ais:
-            ai.update(self.player, self.maze)  
-            
-            # AI와 플레이어 충돌 확인 (플레이어가 은신 중이 아니고 무적 상태가 아닐 때만)
-            if (ai.pos.x == self.player.pos.x and 
-                ai.pos.y == self.player.pos.y and
-                not self.player.is_stealthed() and 
-                not self.player.is_invincible()): # 무적 상태 확인
-                self.state = GameState.LOST
-                return
+            ai.update(self.player, self.walkable)
+            ax, ay = ai.pos.x, ai.pos.y
+            ai_cells.setdefault((ax, ay), []).append(ai)
+            dx, dy = ax - player_x, ay - player_y
+            dist_sq = dx*dx + dy*dy
+            if dist_sq < min_ai_dist_sq:
+                min_ai_dist_sq = dist_sq
+        self._ai_cells = ai_cells
+        self._min_ai_dist_sq = min_ai_dist_sq
+
+        # AI와 플레이어 충돌 확인 (플레이어가 은신 중이 아니고 무적 상태가 아닐 때만)
+        if ((player_x, player_y) in ai_cells and
+            not self.player.is_stealthed() and 
+            not self.player.is_invincible()): # 무적 상태 확인
+            self.state = GameState.LOST
+            return
     
     def spawn_enhanced_ai(self):
         """강화 AI 생성"""
-        empty_spaces = []
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                # 플레이어 위치 근처는 피합니다.
-                if (self.maze[y][x] == 0 and 
-                    Position(x, y).distance_to(self.player.pos) > 8):
-                    empty_spaces.append(Position(x, y))
+        # 플레이어 위치 근처는 피합니다.
+        empty_spaces = self.floor_cells_far_from(self.player.pos.x, self.player.pos.y, 8 * 8)
         
         if empty_spaces:
-            enhanced_pos = random.choice(empty_spaces)
-            enhanced_ai = AI(enhanced_pos.x, enhanced_pos.y, AIType.ENHANCED, self)
+            enhanced_x, enhanced_y = random.choice(empty_spaces)
+            enhanced_ai = AI(enhanced_x, enhanced_y, AIType.ENHANCED, self)
             self.ais.append(enhanced_ai)
             self.add_game_message("강화 AI가 생성되었습니다!", duration=3.0)
 
@@ -890,10 +1181,20 @@ class StarMazeGame:
         :param size: 별의 크기 (대략적인 반지름)
         """
         if isinstance(pos, Position):
-            center_x, center_y = pos.x * TILE_SIZE + TILE_SIZE // 2, pos.y * TILE_SIZE + TILE_SIZE // 2
+            tile_x, tile_y = pos.x, pos.y
         else:
-            center_x, center_y = pos[0] * TILE_SIZE + TILE_SIZE // 2, pos[1] * TILE_SIZE + TILE_SIZE // 2
-
+            tile_x, tile_y = pos[0], pos[1]
+
+        # 별 모양은 색상과 크기로만 정해지므로 타일 크기 스프라이트로 한 번만 그려 두고 복사
+        sprite = self._star_sprites.get((color, size))
+        if sprite is None:
+            sprite = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA).convert_alpha()
+            self._draw_star_polygon(sprite, color, TILE_SIZE // 2, TILE_SIZE // 2, size)
+            self._star_sprites[(color, size)] = sprite
+        surface.blit(sprite, (tile_x * TILE_SIZE, tile_y * TILE_SIZE))
+
+    def _draw_star_polygon(self, surface, color, center_x, center_y, size):
+        """중심 (center_x, center_y)에 5개의 꼭지점을 가진 별 다각형을 그립니다."""
         outer_radius = size
         inner_radius = size * 0.4  # 별의 안쪽 반지름 (뾰족한 정도)
         num_points = 5
@@ -933,23 +1234,21 @@ class StarMazeGame:
         pygame.draw.rect(surface, color, (screen_x, screen_y, TILE_SIZE // 2, TILE_SIZE // 2))
 
 
-    def draw_entities(self):
-        """플레이어, 별, AI, 탈출구, 미니맵 아이템, 이벤트 상자 그리기"""
-        player_x, player_y = self.player.pos.x, self.player.pos.y
-        
-        # 시야 전체 적용 여부 (미니맵 활성화 또는 맵 어두워짐 이벤트가 아닐 때)
-        is_full_vision = time.time() < self.minimap_active_until and self.current_event != EventType.MAP_DARK
-
+    def draw_visible_objects(self, player_x, player_y, is_full_vision):
+        """시야 안(또는 미니맵 활성화 시 전체)의 별, 탈출구, 아이템, 이벤트 상자, AI 그리기"""
         # 별 그리기
-        for star in self.stars:
+        for star in self.star_positions.values():
             dx, dy = star.x - player_x, star.y - player_y
-            if is_full_vision or (dx*dx + dy*dy <= VISION_RADIUS ** 2 and self.current_event != EventType.MAP_DARK):
+            if not is_full_vision and (dx > VISION_RADIUS or dx < -VISION_RADIUS or
+                                       dy > VISION_RADIUS or dy < -VISION_RADIUS):
+                continue # 시야 사각형 밖이면 거리 계산 없이 건너뜀
+            if is_full_vision or dx*dx + dy*dy <= VISION_RADIUS_SQ:
                 self.draw_star(self.screen, STAR_COLOR, star, TILE_SIZE // 2 - 2)
         
         # 탈출구 그리기 (self.exit_pos가 None이 아닐 때만)
         if self.exit_pos is not None:
             dx, dy = self.exit_pos.x - player_x, self.exit_pos.y - player_y
-            if is_full_vision or (dx*dx + dy*dy <= VISION_RADIUS ** 2 and self.current_event != EventType.MAP_DARK):
+            if is_full_vision or dx*dx + dy*dy <= VISION_RADIUS_SQ:
                 screen_x = self.exit_pos.x * TILE_SIZE
                 screen_y = self.exit_pos.y * TILE_SIZE
                 pygame.draw.rect(self.screen, EXIT_COLOR, 
@@ -958,42 +1257,47 @@ class StarMazeGame:
         # 미니맵 아이템 그리기 (현재 위치에 있고 아직 획득하지 않았을 때)
         if self.minimap_item_pos:
             dx, dy = self.minimap_item_pos.x - player_x, self.minimap_item_pos.y - player_y
-            if is_full_vision or (dx*dx + dy*dy <= VISION_RADIUS ** 2 and self.current_event != EventType.MAP_DARK):
+            if is_full_vision or dx*dx + dy*dy <= VISION_RADIUS_SQ:
                  self.draw_minimap_item(self.screen, MINIMAP_ITEM_COLOR, self.minimap_item_pos, TILE_SIZE // 3)
 
         # 이벤트 상자 그리기 (현재 위치에 있고 아직 획득하지 않았을 때)
         if self.event_box_pos:
             dx, dy = self.event_box_pos.x - player_x, self.event_box_pos.y - player_y
-            if is_full_vision or (dx*dx + dy*dy <= VISION_RADIUS ** 2 and self.current_event != EventType.MAP_DARK):
+            if is_full_vision or dx*dx + dy*dy <= VISION_RADIUS_SQ:
                 self.draw_event_box(self.screen, EVENT_BOX_COLOR, self.event_box_pos)
 
         # AI 그리기
         for ai in self.ais:
             dx, dy = ai.pos.x - player_x, ai.pos.y - player_y
-            if is_full_vision or (dx*dx + dy*dy <= VISION_RADIUS ** 2 and self.current_event != EventType.MAP_DARK):
-                screen_x = ai.pos.x * TILE_SIZE + 2
-                screen_y = ai.pos.y * TILE_SIZE + 2
-                pygame.draw.circle(self.screen, ai.get_color(), 
-                                   (screen_x + TILE_SIZE//2 - 2, screen_y + TILE_SIZE//2 - 2), 
-                                   TILE_SIZE//2 - 2)
-        # 플레이어 그리기
-        screen_x = player_x * TILE_SIZE + 2
-        screen_y = player_y * TILE_SIZE + 2
-        color = PLAYER_COLOR
+            if not is_full_vision and (dx > VISION_RADIUS or dx < -VISION_RADIUS or
+                                       dy > VISION_RADIUS or dy < -VISION_RADIUS):
+                continue # 시야 사각형 밖이면 거리 계산 없이 건너뜀
+            if is_full_vision or dx*dx + dy*dy <= VISION_RADIUS_SQ:
+                self.screen.blit(self._ai_sprites[ai.get_color()], (ai.pos.x * TILE_SIZE, ai.pos.y * TILE_SIZE))
+
+    def draw_entities(self):
+        """플레이어, 별, AI, 탈출구, 미니맵 아이템, 이벤트 상자 그리기"""
+        player_x, player_y = self.player.pos.x, self.player.pos.y
+        
+        # 맵 어두워짐 이벤트 중에는 플레이어 외에 아무것도 보이지 않으므로 거리 계산 자체를 건너뜀
+        if self.current_event != EventType.MAP_DARK:
+            # 시야 전체 적용 여부 (미니맵 활성화 시)
+            is_full_vision = self.now < self.minimap_active_until
+            self.draw_visible_objects(player_x, player_y, is_full_vision)
+
+        # 플레이어 그리기 (상태별로 미리 그려 둔 스프라이트 사용)
         if self.player.is_stealthed():
-            color = (color[0]//2, color[1]//2, color[2]//2)  # 은신 시 어둡게
+            player_sprite = self.player_stealth_sprite # 은신 시 어둡게
         elif self.player.is_invincible():
-            # 무적 상태일 때 색상 변경 (예: 흰색 테두리)
-            pygame.draw.rect(self.screen, (255, 255, 255), (screen_x-2, screen_y-2, TILE_SIZE, TILE_SIZE), 2) # 테두리
-            color = PLAYER_COLOR # 내부 색상은 유지
-        
-        pygame.draw.rect(self.screen, color, 
-                         (screen_x, screen_y, TILE_SIZE-4, TILE_SIZE-4))
+            player_sprite = self.player_invincible_sprite # 무적 상태일 때 흰색 테두리
+        else:
+            player_sprite = self.player_sprite
+        self.screen.blit(player_sprite, (player_x * TILE_SIZE, player_y * TILE_SIZE))
     
         # 은신 남은 시간 게임 화면 내 표시
         stealth_remaining = self.player.get_stealth_remaining_time()
         if stealth_remaining > 0:
-            stealth_timer_text = self.large_font.render(f"은신: {stealth_remaining:.1f}초", True, (0, 255, 0))
+            stealth_timer_text = self.render_text(self.large_font, f"은신: {stealth_remaining:.1f}초", (0, 255, 0))
             alpha_value = 180
             stealth_timer_text.set_alpha(alpha_value)
             text_rect = stealth_timer_text.get_rect(center=(MAZE_WIDTH * TILE_SIZE // 2, 50))
@@ -1004,77 +1308,50 @@ class StarMazeGame:
         player_x, player_y = self.player.pos.x, self.player.pos.y
         
         # 미니맵 활성화 여부 확인
-        minimap_active = time.time() < self.minimap_active_until
+        minimap_active = self.now < self.minimap_active_until
         # 맵 어두워짐 이벤트 활성화 여부 확인
-        map_dark_active = self.current_event == EventType.MAP_DARK and time.time() < self.event_active_until
-
-        for y in range(len(self.maze)):
-            for x in range(len(self.maze[0])):
-                screen_x = x * TILE_SIZE
-                screen_y = y * TILE_SIZE
-                
-                # 시야 범위 확인 (미니맵 활성화 시 항상 True, 맵 어두워짐 시 항상 False)
-                if minimap_active:
-                    in_vision = True
-                elif map_dark_active: # 맵 어두워짐 이벤트 시, 플레이어 위치만 보임
-                    in_vision = (x == player_x and y == player_y)
-                else: # 일반 시야 제한
-                    in_vision = math.sqrt((x - player_x)**2 + (y - player_y)**2) <= VISION_RADIUS
-                
-                if in_vision:
-                    # 벽과 바닥 그리기
-                    if self.maze[y][x] == 1:
-                        pygame.draw.rect(self.screen, WALL_COLOR, 
-                                         (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
-                    else:
-                        pygame.draw.rect(self.screen, BLACK, 
-                                         (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
-                else:
-                    # 시야 밖은 어둡게
-                    pygame.draw.rect(self.screen, FOG_COLOR, 
-                                     (screen_x, screen_y, TILE_SIZE, TILE_SIZE))
+        map_dark_active = self.current_event == EventType.MAP_DARK and self.now < self.event_active_until
+
+        # 미로는 게임 중 바뀌지 않으므로 미리 그려 둔 표면을 한 번에 복사
+        self.screen.blit(self.maze_surface, (0, 0))
+
+        if minimap_active: # 미니맵 활성화 시 안개 없이 전체 표시
+            return
+
+        # 안개 모양은 플레이어 위치와 시야 모드에만 의존하므로 바뀌었을 때만 다시 만듦
+        fog_key = (map_dark_active, player_x, player_y)
+        if fog_key != self._fog_key:
+            # 안개 밖은 항상 덮여 있으므로 지난번에 뚫은 시야 영역만 다시 덮고 새 영역을 뚫음
+            if self._fog_hole_rect is None:
+                self.fog_surface.fill(FOG_COLOR)
+            else:
+                self.fog_surface.fill(FOG_COLOR, self._fog_hole_rect)
+            if map_dark_active: # 맵 어두워짐 이벤트 시, 플레이어 위치만 보임
+                self._fog_hole_rect = pygame.Rect(player_x * TILE_SIZE, player_y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                self.fog_surface.fill(FOG_HOLE_KEY, self._fog_hole_rect)
+            else: # 일반 시야 제한
+                self._fog_hole_rect = self.fog_surface.blit(
+                    self.vision_cutout,
+                    ((player_x - VISION_RADIUS) * TILE_SIZE, (player_y - VISION_RADIUS) * TILE_SIZE))
+            self._fog_key = fog_key
+        self.screen.blit(self.fog_surface, (0, 0))
 
     def draw_ui(self):
-        """UI 요소 그리기 (동적 y좌표 관리로 겹침 방지)"""
-        # UI 배경
-        ui_rect = pygame.Rect(MAZE_WIDTH * TILE_SIZE, 0, 
-                              SCREEN_WIDTH_WITH_UI - MAZE_WIDTH * TILE_SIZE, SCREEN_HEIGHT)
-        pygame.draw.rect(self.screen, UI_BG_COLOR, ui_rect)
-        
-        # --- 동적 Y 좌표 관리를 위한 변수 ---
-        x_padding = MAZE_WIDTH * TILE_SIZE + 10 # UI 영역의 x 시작 위치
-        y_offset = 10  # UI 요소들의 y 시작 위치
-        line_height = 30 # 각 줄의 높이 (여백 포함)
-        
-        # 1. 시간 표시
-        remaining_time = max(0, GAME_TIME_LIMIT - (time.time() - self.start_time))
+        """UI 요소 그리기 (표시 내용이 바뀌었을 때만 패널을 다시 그리고, 평소에는 캐시된 패널만 복사)"""
+        # 1. 남은 시간
+        remaining_time = max(0, GAME_TIME_LIMIT - (self.now - self.start_time))
         minutes = int(remaining_time // 60)
         seconds = int(remaining_time % 60)
-        time_text = self.font.render(f"시간: {minutes:02d}:{seconds:02d}", True, WHITE)
-        self.screen.blit(time_text, (x_padding, y_offset))
-        y_offset += line_height # 다음 UI를 위해 y_offset 증가
-
-        # 2. 수집한 별 개수
-        stars_text = self.font.render(f"별: {self.player.stars_collected}/5", True, WHITE)
-        self.screen.blit(stars_text, (x_padding, y_offset))
-        y_offset += line_height
+        time_line = f"시간: {minutes:02d}:{seconds:02d}"
 
-        # 3. 은신 충전량
-        stealth_charges_text = self.font.render(f"은신: {self.player.stealth_charges}", True, WHITE)
-        self.screen.blit(stealth_charges_text, (x_padding, y_offset))
-        y_offset += line_height
-
-        # 4. 미니맵 활성화 상태 표시
-        if time.time() < self.minimap_active_until:
-            minimap_remaining_time = max(0, self.minimap_active_until - time.time())
-            minimap_text = self.font.render(f"미니맵: {minimap_remaining_time:.1f}초", True, MINIMAP_ITEM_COLOR)
-            self.screen.blit(minimap_text, (x_padding, y_offset))
+        # 4. 미니맵 활성화 상태
+        if self.now < self.minimap_active_until:
+            minimap_remaining_time = max(0, self.minimap_active_until - self.now)
+            minimap_line = (f"미니맵: {minimap_remaining_time:.1f}초", MINIMAP_ITEM_COLOR)
         else:
-            minimap_text = self.font.render("미니맵: 비활성", True, WHITE)
-            self.screen.blit(minimap_text, (x_padding, y_offset))
-        y_offset += line_height
+            minimap_line = ("미니맵: 비활성", WHITE)
 
-        # 5. 이벤트 상태 표시 (조건부 렌더링)
+        # 5. 이벤트 상태
         if self.current_event:
             event_name = ""
             event_color = WHITE
@@ -1091,111 +1368,107 @@ class StarMazeGame:
                 event_name = "적 속도 UP"
                 event_color = (255, 100, 100)
             
-            event_remaining_time = max(0, self.event_active_until - time.time())
-            event_text = self.font.render(f"이벤트: {event_name} {event_remaining_time:.1f}초", True, event_color)
-            self.screen.blit(event_text, (x_padding, y_offset))
-            y_offset += line_height # 이벤트가 표시되었을 때만 y_offset 증가
+            event_remaining_time = max(0, self.event_active_until - self.now)
+            event_line = (f"이벤트: {event_name} {event_remaining_time:.1f}초", event_color)
         else:
-            # 이벤트가 없을 때는 공간을 차지하지 않도록 y_offset을 증가시키지 않음
-            event_text = self.font.render("이벤트: 없음", True, WHITE)
-            self.screen.blit(event_text, (x_padding, y_offset))
-            y_offset += line_height
+            event_line = ("이벤트: 없음", WHITE)
 
-        # 6. AI 근접 경고 기능 (조건부 렌더링)
-        min_ai_dist_sq = float('inf')
-        for ai in self.ais:
-            dx = ai.pos.x - self.player.pos.x
-            dy = ai.pos.y - self.player.pos.y
-            dist_sq = dx*dx + dy*dy
-            if dist_sq < min_ai_dist_sq: 
-                min_ai_dist_sq = dist_sq
-        
+        # 6. AI 근접 경고 (거리는 update에서 AI 이동 후 계산해 둠)
+        min_ai_dist_sq = self._min_ai_dist_sq
         warning_color = None
         if min_ai_dist_sq <= 16:
             warning_color = WARNING_RED
         elif min_ai_dist_sq <= 49:
             warning_color = WARNING_YELLOW
 
+        ui_state = (time_line, self.player.stars_collected, self.player.stealth_charges,
+                    minimap_line, event_line, warning_color, tuple(self.get_star_directions()))
+        if ui_state != self._ui_state:
+            self._render_ui_panel(*ui_state)
+            self._ui_state = ui_state
+        self.screen.blit(self.ui_panel, (MAZE_WIDTH * TILE_SIZE, 0))
+
+    def _render_ui_panel(self, time_line, stars_collected, stealth_charges,
+                         minimap_line, event_line, warning_color, directions):
+        """UI 패널 표면을 주어진 표시 내용으로 다시 그립니다 (동적 y좌표 관리로 겹침 방지)"""
+        panel = self.ui_panel
+        # UI 배경
+        panel.fill(UI_BG_COLOR)
+        
+        # --- 동적 Y 좌표 관리를 위한 변수 ---
+        x_padding = 10 # 패널 안에서의 x 시작 위치
+        y_offset = 10  # UI 요소들의 y 시작 위치
+        line_height = 30 # 각 줄의 높이 (여백 포함)
+        
+        # 1. 시간 표시
+        time_text = self.render_text(self.font, time_line, WHITE)
+        panel.blit(time_text, (x_padding, y_offset))
+        y_offset += line_height # 다음 UI를 위해 y_offset 증가
+
+        # 2. 수집한 별 개수
+        stars_text = self.render_text(self.font, f"별: {stars_collected}/5", WHITE)
+        panel.blit(stars_text, (x_padding, y_offset))
+        y_offset += line_height
+
+        # 3. 은신 충전량
+        stealth_charges_text = self.render_text(self.font, f"은신: {stealth_charges}", WHITE)
+        panel.blit(stealth_charges_text, (x_padding, y_offset))
+        y_offset += line_height
+
+        # 4. 미니맵 활성화 상태 표시
+        minimap_text = self.render_text(self.font, *minimap_line)
+        panel.blit(minimap_text, (x_padding, y_offset))
+        y_offset += line_height
+
+        # 5. 이벤트 상태 표시
+        event_text = self.render_text(self.font, *event_line)
+        panel.blit(event_text, (x_padding, y_offset))
+        y_offset += line_height
+
+        # 6. AI 근접 경고 기능 (조건부 렌더링)
         if warning_color:
-            # 경고 아이콘 (삼각형)
-            icon_points = [
-                (x_padding + 10, y_offset + 5),
-                (x_padding,      y_offset + 20),
-                (x_padding + 20, y_offset + 20)
-            ]
-            pygame.draw.polygon(self.screen, warning_color, icon_points)
+            # 경고 아이콘 (삼각형, __init__에서 미리 그려 둠)
+            panel.blit(self.warning_icons[warning_color], (x_padding, y_offset))
             
             # 경고 텍스트
-            text = self.font.render("AI 근접 경고!", True, warning_color)
-            self.screen.blit(text, (x_padding + 30, y_offset + 3)) # 아이콘 옆에 텍스트 배치
+            text = self.render_text(self.font, "AI 근접 경고!", warning_color)
+            panel.blit(text, (x_padding + 30, y_offset + 3)) # 아이콘 옆에 텍스트 배치
             y_offset += line_height # 경고가 표시되었을 때만 y_offset 증가
 
         # 7. 별 방향 표시 (섹션 제목 추가)
         y_offset += 10 # 섹션 간격
-        section_title_text = self.font.render("남은 별 방향:", True, WHITE)
-        self.screen.blit(section_title_text, (x_padding, y_offset))
+        section_title_text = self.render_text(self.font, "남은 별 방향:", WHITE)
+        panel.blit(section_title_text, (x_padding, y_offset))
         y_offset += line_height
 
-        directions = self.get_star_directions()
         for i, direction in enumerate(directions):
             # 글자 크기를 small_font로 변경하여 공간 확보
-            direction_text = self.small_font.render(f"별 {i+1}: {direction}", True, STAR_COLOR)
-            self.screen.blit(direction_text, (x_padding + 10, y_offset)) # 들여쓰기
+            direction_text = self.render_text(self.small_font, f"별 {i+1}: {direction}", STAR_COLOR)
+            panel.blit(direction_text, (x_padding + 10, y_offset)) # 들여쓰기
             y_offset += 25 # 작은 폰트에 맞게 줄 간격 조정
 
-        # 8. 컨트롤 설명 (화면 아래쪽에 고정)
-        controls = [
-            "조작법:",
-            "WASD/화살표: 이동",
-            "Shift: 스프린트",
-            "Space: 은신",
-            "",
-            "목표:",
-            "별 5개 수집 후",
-            "초록색 탈출구로!"
-        ]
+        # 8. 컨트롤 설명 (화면 아래쪽에 고정, 글자는 __init__에서 미리 렌더링)
+        control_surfaces = self.control_surfaces
         
         # 이 부분은 화면 하단에 고정되므로 별도의 y 좌표 사용
-        control_y_offset = SCREEN_HEIGHT - len(controls) * 20 - 10
-        for control in controls:
-            control_text = self.small_font.render(control, True, WHITE) # 작은 폰트 사용
-            self.screen.blit(control_text, (x_padding, control_y_offset))
+        control_y_offset = SCREEN_HEIGHT - len(control_surfaces) * 20 - 10
+        for control_text in control_surfaces:
+            panel.blit(control_text, (x_padding, control_y_offset))
             control_y_offset += 20
 
     def draw_game_over(self):
-        """게임 오버 화면"""
-        overlay = pygame.Surface((SCREEN_WIDTH_WITH_UI, SCREEN_HEIGHT))
-        overlay.set_alpha(128)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
-        
-        if self.state == GameState.WON:
-            title = "승리!"
-            subtitle = "별을 모두 모아 탈출했습니다!"
-            color = (0, 255, 0)
-        else:
-            title = "패배!"
-            subtitle = "다시 도전해보세요!"
-            color = (255, 0, 0)
-        
-        title_text = self.large_font.render(title, True, color)
-        subtitle_text = self.font.render(subtitle, True, WHITE)
-        restart_text = self.font.render("R키를 눌러 다시 시작", True, WHITE)
-        
-        title_rect = title_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 - 50))
-        subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2))
-        restart_rect = restart_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 + 50))
+        """게임 오버 화면 (덮개와 글자는 __init__에서 미리 만들어 둠)"""
+        self.screen.blit(self.game_over_overlay, (0, 0))
         
-        self.screen.blit(title_text, title_rect)
-        self.screen.blit(subtitle_text, subtitle_rect)
-        self.screen.blit(restart_text, restart_rect)
+        texts = self.game_over_texts[GameState.WON if self.state == GameState.WON else GameState.LOST]
+        self.screen.blits(texts, doreturn=False)
     
     def draw_menu(self):
         """메인 메뉴"""
         self.screen.fill(BLACK)
         
         # 타이틀
-        title_text = self.large_font.render("Star Maze", True, WHITE)
+        title_text = self.render_text(self.large_font, "Star Maze", WHITE)
         
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 - 200)) # 상단으로 이동
         
@@ -1219,12 +1492,12 @@ class StarMazeGame:
         
         y_offset = SCREEN_HEIGHT//2 - 175 # AI 설명 시작 Y 위치 조정
         for line, color in ai_descriptions:
-            desc_text = self.font.render(line, True, color)
+            desc_text = self.render_text(self.font, line, color)
             self.screen.blit(desc_text, (SCREEN_WIDTH_WITH_UI//2 - desc_text.get_width()//2, y_offset))
             y_offset += 25 # 각 줄 간격
 
         # 시작 메시지
-        start_text = self.large_font.render("Enter키를 눌러 시작", True, WHITE) # 시작 메시지 폰트 크기 변경
+        start_text = self.render_text(self.large_font, "Enter키를 눌러 시작", WHITE) # 시작 메시지 폰트 크기 변경
         start_rect = start_text.get_rect(center=(SCREEN_WIDTH_WITH_UI//2, SCREEN_HEIGHT//2 + 200)) # 하단으로 이동
         
         self.screen.blit(start_text, start_rect)
@@ -1234,6 +1507,9 @@ class StarMazeGame:
         running = True
         
         while running:
+            # 프레임 시각을 한 번만 샘플링해 입력/업데이트/그리기 전체에서 같은 값을 사용
+            self.now = time.time()
+
             # handle_events()가 False를 반환하면 루프 종료
             if not self.handle_events():
                 running = False
@@ -1262,6 +1538,8 @@ class StarMazeGame:
                 self.draw_game_over()
             
             pygame.display.flip()
+            # 프레임 속도를 제한해 CPU를 계속 점유하지 않도록 함 (이동/AI 타이밍은 self.now 기준이라 영향 없음)
+            self.clock.tick(FPS)
             # 웹 환경에서 브라우저가 멈추지 않도록 제어권을 넘겨줍니다.
             await asyncio.sleep(0)
         